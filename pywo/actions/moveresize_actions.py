@@ -65,8 +65,8 @@ def _move(win, direction, vertical_first=True):
                            insideout=(not direction.is_middle),
                            vertical_first=vertical_first)
     geometry = win.geometry
-    geometry.width = min(border.width, geometry.width)
-    geometry.height = min(border.height, geometry.height)
+    geometry.set_size(min(border.width, geometry.width),
+                      min(border.height, geometry.height))
     x = border.x + border.width * direction.x
     y = border.y + border.height * direction.y
     geometry.set_position(x, y, direction)
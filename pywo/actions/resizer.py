@@ -70,8 +70,11 @@ class Resizer(object):
         #TODO: add limit? and use limit geometry instead of workarea?
         current = win.geometry
         workarea = WM.workarea_geometry
-        windows = [window.geometry for window 
-                                   in WM.windows(filters.STANDARD_ON_WORKAREA) 
+        # NOTE: filter by type first, types of all windows are fetched at once
+        others = WM.windows(filters.AND(filters.NORMAL_STATE,
+                                        filters.WORKAREA),
+                            filter_types=filters.STANDARD_TYPE.check_type)
+        windows = [window.geometry for window in others
                                    if window.id != win.id]
         axis_order = [['x', 'y'], ['y', 'x']]
         for axis in axis_order[vertical_first]:
@@ -105,24 +108,31 @@ class Resizer(object):
         xy, xy2, size = _ATTRGETTERS[axis]
         # TODO: use only getattr instead of _ATTRGETTERS
         opposite_axis = ['x', 'y'][axis == 'x']
-        size = {'x':'width', 'y':'height'}[axis]
-        setattr(current, axis, 
-                max(xy(current), xy(workarea)))
-        setattr(current, size, 
-                min(xy2(current), xy2(workarea)) - xy(current))
+        new_xy = max(xy(current), xy(workarea))
+        self.__set_edges(current, axis,
+                         new_xy, min(new_xy + size(current), xy2(workarea)))
         in_axis = self.__windows_in_axis(windows, current, 
                                          opposite_axis, sticky)
         if (axis == 'x' and direction.is_left) or \
            (axis == 'y' and direction.is_top):
             new_xy = self.__top_left(current, workarea, in_axis, 
                                      axis, sticky, insideout)
-            setattr(current, size, xy2(current) - new_xy)
-            setattr(current, axis, new_xy)
+            self.__set_edges(current, axis, new_xy, xy2(current))
         if (axis == 'x' and direction.is_right) or \
            (axis == 'y' and direction.is_bottom):
             new_xy2 = self.__bottom_right(current, workarea, in_axis, 
                                           axis, sticky, insideout)
-            setattr(current, size, new_xy2 - xy(current))
+            self.__set_edges(current, axis, xy(current), new_xy2)
+
+    def __set_edges(self, current, axis, xy, xy2):
+        """Set left and right, or top and bottom edges of current geometry."""
+        # NOTE: set_position() and set_size() keep (x2, y2) up to date
+        if axis == 'x':
+            current.set_position(xy, current.y)
+            current.set_size(xy2 - xy, current.height)
+        else:
+            current.set_position(current.x, xy)
+            current.set_size(current.width, xy2 - xy)
 
 
 def __top_left(current, workarea, windows, 
@@ -44,6 +44,9 @@ class Gravity(object):
 
     """Gravity point as a percentage of width and height of the window."""
 
+    __slots__ = ('x', 'y', 'is_middle', 'is_diagonal',
+                 'is_top', 'is_bottom', 'is_left', 'is_right')
+
     # Predefined gravities, that can be used in config files
     __GRAVITIES = {}
     for xy, names in {
@@ -67,29 +70,14 @@ class Gravity(object):
         """
         self.x = x
         self.y = y
-        self.is_middle = (x == 1.0/2) and (y == 1.0/2)
+        self.is_middle = (x == 0.5) and (y == 0.5)
         # FIXME: should is_middle be also is_diagonal?
-        self.is_diagonal = (not x == 1.0/2) and (not y == 1.0/2)
-
-    @property
-    def is_top(self):
-        """Return True if gravity is toward top."""
-        return self.y < 1.0/2 or self.is_middle
-
-    @property
-    def is_bottom(self):
-        """Return True if gravity is toward bottom."""
-        return self.y > 1.0/2 or self.is_middle
-
-    @property
-    def is_left(self):
-        """Return True if gravity is toward left."""
-        return self.x < 1.0/2 or self.is_middle
-
-    @property
-    def is_right(self):
-        """Return True if gravity is toward right."""
-        return self.x > 1.0/2 or self.is_middle
+        self.is_diagonal = (not x == 0.5) and (not y == 0.5)
+        # Gravity is toward top, bottom, left, right
+        self.is_top = y < 0.5 or self.is_middle
+        self.is_bottom = y > 0.5 or self.is_middle
+        self.is_left = x < 0.5 or self.is_middle
+        self.is_right = x > 0.5 or self.is_middle
 
     def invert(self, vertical=True, horizontal=True):
         """Invert the gravity (left becomes right, top becomes bottom)."""
@@ -117,9 +105,13 @@ class Gravity(object):
             x, y = [Size.parse_value(xy) for xy in gravity.split(',')]
         return Gravity(x, y)
 
+    def __reduce__(self):
+        # NOTE: objects with __slots__ have no __dict__ to be copied
+        #       or pickled, so recreate them from constructor's arguments
+        return (self.__class__, (self.x, self.y))
+
     def __eq__(self, other):
-        return ((self.x, self.y) ==
-                (other.x, other.y))
+        return self.x == other.x and self.y == other.y
 
     def __ne__(self, other):
         return not self == other
@@ -128,10 +120,24 @@ class Gravity(object):
         return '<Gravity x=%.2f, y=%.2f>' % (self.x, self.y)
 
 
-class Size(object):
+class _GeometryBase(object):
+
+    """Common base class of Size, Position and Geometry.
+
+    Geometry inherits from both Size and Position, so all their attributes
+    must be declared in __slots__ of one common base class.
+
+    """
+
+    __slots__ = ('x', 'y', 'width', 'height')
+
+
+class Size(_GeometryBase):
 
     """Size encapsulates width and height of the object."""
 
+    __slots__ = ()
+
     # Pattern matching simple calculations with floating numbers
     __PATTERN = re.compile('^[ 0-9\.\+-/\*]+$')
 
@@ -194,8 +200,11 @@ class Size(object):
             return Size(width, height)
         return None
 
+    def __reduce__(self):
+        return (self.__class__, (self.width, self.height))
+
     def __eq__(self, other):
-        return ((self.width, self.height) == (other.width, other.height))
+        return self.width == other.width and self.height == other.height
 
     def __ne__(self, other):
         return not self == other
@@ -204,7 +213,7 @@ class Size(object):
         return '<Size width=%s, height=%s>' % (self.width, self.height)
 
 
-class Position(object):
+class Position(_GeometryBase):
 
     """Position encapsulates Position of the object.
 
@@ -212,14 +221,19 @@ class Position(object):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
     # TODO: add parse for relative and absolute values
 
+    def __reduce__(self):
+        return (self.__class__, (self.x, self.y))
+
     def __eq__(self, other):
-        return ((self.x, self.y) == (other.x, other.y))
+        return self.x == other.x and self.y == other.y
 
     def __ne__(self, other):
         return not self == other
@@ -235,36 +249,42 @@ class Geometry(Position, Size):
     Position coordinates (x, y) starts at top left corner of the desktop.
     (x2, y2) are the coordinates of the bottom-right corner of the object.
 
+    (x2, y2) are stored, not calculated when read. They are kept up to date
+    only by set_position() and set_size(), so use these methods instead of
+    setting x, y, width, height directly.
+
     """
 
+    __slots__ = ('x2', 'y2')
+
     # TODO: Geometry + Size, Geometry + Position, Geometry * Size
 
     __DEFAULT_GRAVITY = Gravity(0, 0)
 
     def __init__(self, x, y, width, height,
                  gravity=__DEFAULT_GRAVITY):
-        Size.__init__(self, int(width), int(height))
-        Position.__init__(self, int(x), int(y))
+        # NOTE: size must be set before position, (x2, y2) are updated
+        #       when (x, y) are set
+        self.width = int(width)
+        self.height = int(height)
         self.set_position(x, y, gravity)
 
-    @property
-    def x2(self):
-        """X coordinate of bottom right corner."""
-        return self.x + self.width
-
-    @property
-    def y2(self):
-        """Y coordinate of bottom right corner."""
-        return self.y + self.height
-
     def set_position(self, x, y, gravity=__DEFAULT_GRAVITY):
         """Set position with (x,y) as gravity point."""
         # FIXME: why x,y not position?
         self.x = int(x - self.width * gravity.x)
         self.y = int(y - self.height * gravity.y)
+        self.x2 = self.x + self.width
+        self.y2 = self.y + self.height
+
+    def set_size(self, width, height):
+        """Set size, position of top left corner is not changed."""
+        self.width = int(width)
+        self.height = int(height)
+        self.x2 = self.x + self.width
+        self.y2 = self.y + self.height
 
-    # TODO: def set_size(self, size, gravity)
-    #       int() !!!
+    # TODO: set_size() with gravity point, like set_position()?
 
     def __and__(self, other):
         """Return the intersection with another geometry
@@ -282,6 +302,9 @@ class Geometry(Position, Size):
             return Geometry(x, y, width, height)
         else:
             return None
+
+    def __reduce__(self):
+        return (self.__class__, (self.x, self.y, self.width, self.height))
     
     def __eq__(self, other):
         # NOTE: need to check type(other) for position == geometry,
@@ -290,8 +313,8 @@ class Geometry(Position, Size):
             return Size.__eq__(self, other)
         if type(other) == Position:
             return Position.__eq__(self, other)
-        return ((self.x, self.y, self.width, self.height) ==
-                (other.x, other.y, other.width, other.height))
+        return self.x == other.x and self.y == other.y and \
+               self.width == other.width and self.height == other.height
 
     def __ne__(self, other):
         return not self == other
@@ -305,6 +328,8 @@ class Extents(object):
 
     """Extents encapsulate Window extents (decorations)."""
 
+    __slots__ = ('left', 'right', 'top', 'bottom', '__borderless')
+
     def __init__(self, left, right, top, bottom):
         self.top = top or 0
         self.bottom = bottom or 0
@@ -325,6 +350,11 @@ class Extents(object):
         """Return sum of top and bottom extents."""
         return self.top + self.bottom
 
+    def __reduce__(self):
+        if self.__borderless:
+            return (self.__class__, (None, None, None, None))
+        return (self.__class__, (self.left, self.right, self.top, self.bottom))
+
     def __eq__(self, other):
         return ((self.left, self.right, self.top, self.bottom) ==
                 (other.left, other.right, other.top, other.bottom))
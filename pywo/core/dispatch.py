@@ -21,8 +21,9 @@
 """dispatch.py - dispatch events generated by X Server."""
 
 import logging
+import os
+import select
 import threading
-import time
 
 
 __author__ = "Wojciech 'KosciaK' Pietrzok"
@@ -31,46 +32,83 @@ __author__ = "Wojciech 'KosciaK' Pietrzok"
 log = logging.getLogger(__name__)
 
 
-class EventDispatcher(threading.Thread):
+class EventDispatcher(object):
 
     """Checks the event queue and dispatches events to correct handlers.
 
     EventDispatcher will run in separate thread. Thread is not started 
     until first EventHandler is registered, and stopped when there are no
-    handlers left.
+    handlers left. New thread is started when handlers are registered again.
 
     """
 
+    # Maximal time (in seconds) to wait for the connection to be readable.
+    # Other threads waiting for replies may read events from the connection
+    # into Xlib's queue, such events are dispatched after this time at most.
+    __TIMEOUT = 0.1
+
     def __init__(self, display):
-        threading.Thread.__init__(self, name='EventDispatcher')
-        self.setDaemon(True)
         self.__display = display
-        self.__root = display.screen().root
+        self.__root_id = display.screen().root.id
         self.__handlers = {} # {event.type: {window.id: set([handler, ]), }, }
-
-    def run(self):
+        # Guards starting and stopping of the thread running main loop
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__stopped = True
+        # Writing to this pipe wakes up main loop waiting for events
+        self.__wakeup_read = self.__wakeup_write = None
+
+    def __run(self):
         """Main loop - perform event queue checking.
 
-        Every 100ms check event queue for pending events and dispatch them.
-        If there are no registered handlers stop running.
+        Dispatch all pending events, then wait until X Server's connection
+        is readable (but no longer than __TIMEOUT seconds). If there are
+        no registered handlers left stop running.
 
         """
         log.debug('EventDispatcher started')
-        while self.__handlers:
+        connections = [self.__display, self.__wakeup_read]
+        while True:
+            with self.__lock:
+                if self.__stopped:
+                    # NOTE: register() will start new thread from now on
+                    self.__thread = None
+                    os.close(self.__wakeup_read)
+                    os.close(self.__wakeup_write)
+                    self.__wakeup_read = self.__wakeup_write = None
+                    break
+            # NOTE: events might be already read from the connection and
+            #       queued by Xlib, so connection is not readable even if
+            #       there are pending events. Dispatch them before waiting.
             while self.__display.pending_events():
                 self.__dispatch(self.__display.next_event())
-            time.sleep(0.1)
+            readable, writable, exceptional = select.select(connections,
+                                                            [], [],
+                                                            self.__TIMEOUT)
+            if self.__wakeup_read in readable:
+                os.read(self.__wakeup_read, 4096)
         log.debug('EventDispatcher stopped')
 
+    def __start(self):
+        """Start main loop in new thread, unless it is already running."""
+        with self.__lock:
+            self.__stopped = False
+            if self.__thread:
+                return
+            self.__wakeup_read, self.__wakeup_write = os.pipe()
+            self.__thread = threading.Thread(target=self.__run,
+                                             name='EventDispatcher')
+            self.__thread.daemon = True
+            self.__thread.start()
+
     def register(self, window, handler):
         """Register event handler and return new window's event mask."""
-        log.debug('Registering %s for %s' % (handler, window))
+        log.debug('Registering %s for %s', handler, window)
         for event_type in handler.types:
             type_handlers = self.__handlers.setdefault(event_type, {})
             win_handlers = type_handlers.setdefault(window.id, set())
             win_handlers.add(handler)
-        if not self.isAlive():
-            self.start()
+        self.__start()
         return self.__get_masks(window.id)
 
     def unregister(self, window=None, handler=None):
@@ -83,22 +121,35 @@ class EventDispatcher(threading.Thread):
         if not window:
             log.debug('Unregistering all handlers for all windows')
             self.__handlers.clear()
+            self.__stop()
             return []
         if not handler:
-            log.debug('Unregistering all handlers for %s' % (window))
+            log.debug('Unregistering all handlers for %s', window)
         else:
-            log.debug('Unregistering %s for %s' % (handler, window))
+            log.debug('Unregistering %s for %s', handler, window)
         for event_type, type_handlers in self.__handlers.items():
-            if not window.id in type_handlers:
+            win_handlers = type_handlers.get(window.id)
+            if win_handlers is None:
                 continue
             if handler:
-                type_handlers[window.id].discard(handler)
+                win_handlers.discard(handler)
+                if not win_handlers:
+                    type_handlers.pop(window.id)
             else:
-                type_handlers.pop(window.id, None)
+                type_handlers.pop(window.id)
             if not type_handlers:
                 self.__handlers.pop(event_type)
+        if not self.__handlers:
+            self.__stop()
         return self.__get_masks(window.id)
 
+    def __stop(self):
+        """Stop main loop, and wake it up if it is waiting for events."""
+        with self.__lock:
+            if not self.__stopped:
+                self.__stopped = True
+                os.write(self.__wakeup_write, 'x')
+
     def __get_masks(self, window_id):
         """Return event type masks for given window."""
         masks = set()
@@ -125,19 +176,25 @@ class EventDispatcher(threading.Thread):
             event.window - the window that has been changed
 
         """
-        if not event.type in self.__handlers:
+        type_handlers = self.__handlers.get(event.type)
+        if type_handlers is None:
             # Just skip unwanted events types
             return
-        type_handlers = self.__handlers[event.type]
-        handlers = []
-        if hasattr(event, 'parent') and event.parent.id in type_handlers:
-            handlers.extend(type_handlers[event.parent.id])
-        elif hasattr(event, 'event') and event.event.id in type_handlers:
-            handlers.extend(type_handlers[event.event.id])
-        elif hasattr(event, 'window') and event.window.id in type_handlers:
-            handlers.extend(type_handlers[event.window.id])
-        if self.__root in type_handlers:
-            handlers.extend(type_handlers[self.__root])
+        win_handlers = None
+        if hasattr(event, 'parent'):
+            win_handlers = type_handlers.get(event.parent.id)
+        if win_handlers is None and hasattr(event, 'event'):
+            win_handlers = type_handlers.get(event.event.id)
+        if win_handlers is None and hasattr(event, 'window'):
+            win_handlers = type_handlers.get(event.window.id)
+        # NOTE: copy handlers, event handling may (un)register handlers
+        handlers = list(win_handlers or ())
+        # NOTE: handlers are registered with window's id, root window's
+        #       handlers get events reported on all windows (including
+        #       those reported on no window, like X.MappingNotify)
+        root_handlers = type_handlers.get(self.__root_id)
+        if root_handlers and root_handlers is not win_handlers:
+            handlers.extend(root_handlers)
         for handler in handlers:
             handler.handle_event(event)
 
@@ -160,14 +160,12 @@ class KeyHandler(EventHandler):
 
     def grab_keys(self, window):
         """Grab keys and start listening to window's events."""
-        for mask, code in self.keys:
-            window.grab_key(mask, code, self.numlock, self.capslock)
+        window.grab_keys(self.keys, self.numlock, self.capslock)
         window.register(self)
 
     def ungrab_keys(self, window):
         """Ungrab keys and stop listening to window's events."""
-        for mask, code in self.keys:
-            window.ungrab_key(mask, code, self.numlock, self.capslock)
+        window.ungrab_keys(self.keys, self.numlock, self.capslock)
         window.unregister(self)
 
 
@@ -337,6 +335,53 @@ class PropertyNotifyHandler(EventHandler):
             self.__property(event)
 
 
+class MappingNotifyEvent(Event):
+
+    """Class representing X.MappingNotify events.
+
+    This event is generated when keyboard, modifiers, or pointer mapping
+    is changed. It is sent to all clients, it is not reported on any window.
+
+    """
+
+    KEYBOARD = X.MappingKeyboard
+    MODIFIER = X.MappingModifier
+    POINTER = X.MappingPointer
+
+    def __init__(self, event):
+        # NOTE: there's no event.window, so Event.__init__ can't be used
+        self._event = event
+        self.type = event.type
+        self.window_id = None
+        self.request = event.request
+        self.first_keycode = event.first_keycode
+        self.count = event.count
+
+    def refresh_keyboard_mapping(self):
+        """Update keyboard mapping, before keys are parsed again."""
+        Window.refresh_keyboard_mapping(self._event)
+
+
+class MappingNotifyHandler(EventHandler):
+
+    """Handler for X.MappingNotify events of keyboard and modifiers."""
+
+    def __init__(self, keyboard=None):
+        """
+        keyboard - function that will handle events
+        """
+        # NOTE: no mask is needed, X.MappingNotify is always reported
+        EventHandler.__init__(self, [],
+                              {X.MappingNotify: (MappingNotifyEvent,
+                                                 self.keyboard)})
+        self.__keyboard = keyboard
+
+    def keyboard(self, event):
+        """Handle MappingNotifyEvent generated by X.MappingNotify event."""
+        if event.request != MappingNotifyEvent.POINTER and self.__keyboard:
+            self.__keyboard(event)
+
+
 class ConfigureNotifyEvent(Event):
 
     """Class representing X.ConfigureNotify events.
@@ -39,7 +39,10 @@ class IncludeType(object):
         self.allowed_types = types
 
     def __call__(self, window):
-        type = window.type
+        return self.check_type(window.id, window.type)
+
+    def check_type(self, win_id, type):
+        """Check window's type, can be used as windows() filter_types."""
         # NOTE: Some normal windows have no type set (e.g. tvtime)
         for allowed_type in self.allowed_types:
             if allowed_type in type:
@@ -55,7 +58,10 @@ class ExcludeType(object):
         self.not_allowed_types = types
 
     def __call__(self, window):
-        type = window.type
+        return self.check_type(window.id, window.type)
+
+    def check_type(self, win_id, type):
+        """Check window's type, can be used as windows() filter_types."""
         for not_allowed_type in self.not_allowed_types:
             if not_allowed_type in type:
                 return False
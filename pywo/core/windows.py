@@ -21,6 +21,8 @@
 """windows.py - classes and functions related to windows and window managers."""
 
 import logging
+import sys
+import threading
 import time
 
 from Xlib import X, Xutil, Xatom
@@ -133,15 +135,28 @@ class Window(XObject):
 
     def __init__(self, win_id):
         XObject.__init__(self, win_id)
+        # Raw extents info, changes only when decorations are changed
+        self.__raw_extents = None
+
+    def _request_type(self):
+        """Send request for window's type and return function waiting for reply.
+
+        Returned function returns tuple of window's type(s).
+
+        """
+        # _NET_WM_WINDOW_TYPE, ATOM[]/32
+        request = self._request_property('_NET_WM_WINDOW_TYPE')
+        def reply():
+            type = request()
+            if not type:
+                return CustomTuple([Type.NONE])
+            return CustomTuple(type.value)
+        return reply
 
     @property
     def type(self):
         """Return tuple of window's type(s)."""
-        # _NET_WM_WINDOW_TYPE, ATOM[]/32
-        type = self.get_property('_NET_WM_WINDOW_TYPE')
-        if not type:
-            return CustomTuple([Type.NONE])
-        return CustomTuple(type.value)
+        return self._request_type()()
 
     @property
     def state(self):
@@ -263,16 +278,28 @@ class Window(XObject):
     def __extents(self):
         """Return raw extents info."""
         # _NET_FRAME_EXTENTS, left, right, top, bottom, CARDINAL[4]/32
-        extents = self.get_property('_NET_FRAME_EXTENTS')
-        if extents:
-            return extents.value
-        else: 
-            return ()
+        if self.__raw_extents is None:
+            extents = self.get_property('_NET_FRAME_EXTENTS')
+            self.__raw_extents = extents and extents.value or ()
+        return self.__raw_extents
+
+    def invalidate_extents(self):
+        """Make sure that extents will be fetched again on next use.
+
+        Extents are cached. They are invalidated when window's state is
+        changed using this object. Use it if decorations might be changed
+        by window manager, or by other Window object.
+
+        """
+        self.__raw_extents = None
 
     @property
     def extents(self):
         """Return window's extents (decorations)."""
-        extents = self.__extents()
+        return self.__calculate_extents(self.__extents())
+
+    def __calculate_extents(self, extents):
+        """Return window's extents using raw extents info."""
         if not extents and self.wm_type in Hacks.CALCULATE_EXTENTS:
             # Hack for Blackbox, IceWM, Sawfish, Window Maker
             win = self._win
@@ -302,9 +329,12 @@ class Window(XObject):
             #extents = (0, 0, 0, 0) # if border is not retained
         return Extents(*extents)
 
-    def __geometry(self):
-        """Return raw geometry info (translated if needed)."""
-        geometry = self._win.get_geometry()
+    def __geometry(self, geometry):
+        """Return raw geometry info (translated if needed).
+
+        geometry - geometry returned by Xlib's get_geometry()
+
+        """
         if self.wm_type in Hacks.PARENT_XY:
             # Hack for Fluxbox, Window Maker
             parent_geo = self._win.query_tree().parent.get_geometry()
@@ -313,6 +343,29 @@ class Window(XObject):
         return (geometry.x, geometry.y, 
                 geometry.width, geometry.height)
 
+    def __fetch_layout(self, hints=False):
+        """Return window's extents, raw geometry info, and normal hints.
+
+        All requests are sent before waiting for the replies, so it takes only
+        one round-trip to X Server instead of three.
+        Extents are requested only if they are not cached, normal hints
+        only if hints is True (otherwise None is returned).
+
+        """
+        extents = None
+        if self.__raw_extents is None:
+            extents = self._request_property('_NET_FRAME_EXTENTS')
+        geometry = self._request_geometry()
+        if hints:
+            hints = self._request_normal_hints()
+        if extents:
+            extents = extents()
+            self.__raw_extents = extents and extents.value or ()
+        geometry = geometry()
+        hints = hints and hints() or None
+        extents = self.__calculate_extents(self.__raw_extents)
+        return (extents, self.__geometry(geometry), hints)
+
     @property
     def geometry(self):
         """Return window's geometry.
@@ -323,9 +376,8 @@ class Window(XObject):
         Position is translated if needed.
 
         """
-        x, y, width, height = self.__geometry()
-        #print x, y, width, height
-        extents = self.extents
+        extents, geometry = self.__fetch_layout()[:2]
+        x, y, width, height = geometry
         if self.wm_type not in Hacks.DONT_TRANSLATE_COORDS and \
            not (Type.METACITY in self.wm_type and not extents):
             # NOTE: in Metacity for windows with no extents 
@@ -351,52 +403,51 @@ class Window(XObject):
 
         """
         # FIXME: probabely doesn't work correctly with windows with border_width
-        extents = self.extents
+        extents, current, hints = self.__fetch_layout(hints=True)
         x = geometry.x
         y = geometry.y
         width = geometry.width - extents.horizontal
         height = geometry.height - extents.vertical
         geometry_size = (width, height)
-        current = self.__geometry()
-        hints = self._win.get_wm_normal_hints()
+        # Read hints only once, not set hints don't limit the size
+        if hints:
+            min_width, min_height = hints.min_width, hints.min_height
+            max_width = hints.max_width or sys.maxsize
+            max_height = hints.max_height or sys.maxsize
+            width_inc, height_inc = hints.width_inc, hints.height_inc
+            base_width, base_height = hints.base_width, hints.base_height
+            win_gravity = hints.win_gravity
+        else:
+            min_width = min_height = 0
+            max_width = max_height = sys.maxsize
+            width_inc = height_inc = 0
+            base_width = base_height = 0
+            win_gravity = None
         # This is a fix for WINE, OpenOffice and KeePassX windows
-        if hints and hints.win_gravity == X.StaticGravity:
+        if win_gravity == X.StaticGravity:
             x += extents.left
             y += extents.top
-        # Reduce size to maximal allowed value
-        if hints and hints.max_width: 
-            width = min([width, hints.max_width])
-        if hints and hints.max_height:
-            height = min([height, hints.max_height])
-        # Don't try to set size lower then minimal
-        if hints and hints.min_width: 
-            width = max([width, hints.min_width])
-        if hints and hints.min_height:
-            height = max([height, hints.min_height])
+        # Reduce size to maximal allowed value, but not lower then minimal
+        width = max(min(width, max_width), min_width)
+        height = max(min(height, max_height), min_height)
         # Set correct size if it is incremental, take base in account
-        if hints and hints.width_inc: 
-            if hints.base_width:
-                base = hints.base_width
-            else:
-                base = current[2] % hints.width_inc
-            width = ((width - base) / hints.width_inc) * hints.width_inc
-            width += base
-            if hints.min_width and width < hints.min_width:
-                width += hints.width_inc
-        if hints and hints.height_inc:
-            if hints.base_height:
-                base = hints.base_height
-            else:
-                base = current[3] % hints.height_inc
-            height = ((height - base) / hints.height_inc) * hints.height_inc
-            height += base
-            if hints.height_inc and height < hints.min_height:
-                height += hints.height_inc
+        if width_inc:
+            base = base_width or current[2] % width_inc
+            width = ((width - base) // width_inc) * width_inc + base
+            if min_width and width < min_width:
+                width += width_inc
+        if height_inc:
+            base = base_height or current[3] % height_inc
+            height = ((height - base) // height_inc) * height_inc + base
+            if height < min_height:
+                height += height_inc
         # Adjust position after size change
         if (width, height) != geometry_size:
             x = x + (geometry_size[0] - width) * on_resize.x
             y = y + (geometry_size[1] - height) * on_resize.y
-        self._win.configure(x=x, y=y, width=width, height=height)
+        # on_resize gravity may give float position
+        self._win.configure(x=int(x), y=int(y),
+                            width=int(width), height=int(height))
 
     def moveresize(self, geometry):
         """Works like set_geometry, but using _NET_MOVERESIZE_WINDOW
@@ -525,6 +576,8 @@ class Window(XObject):
         event_type = self.atom('_NET_WM_STATE')
         mask = X.SubstructureRedirectMask
         self.send_event(data, event_type, mask)
+        # Decorations might change (e.g. for maximized windows)
+        self.invalidate_extents()
 
     def blink(self):
         """For 0.075 second show border around window."""
@@ -595,15 +648,23 @@ class WindowManager(XObject):
 
     # Instance of the WindowManager class, make it Singleton.
     __INSTANCE = None
+    __INSTANCE_LOCK = threading.Lock()
 
     def __new__(cls):
         if cls.__INSTANCE:
             return cls.__INSTANCE
-        manager = object.__new__(cls)
-        XObject.__init__(manager)
-        cls.__INSTANCE = manager
-        manager.update_type()
-        return manager
+        with cls.__INSTANCE_LOCK:
+            if not cls.__INSTANCE:
+                manager = object.__new__(cls)
+                XObject.__init__(manager)
+                manager.update_type()
+                cls.__INSTANCE = manager
+        return cls.__INSTANCE
+
+    def __init__(self):
+        # NOTE: __init__ is called every time WindowManager() is used,
+        #       instance is already initialized in __new__
+        pass
 
     @property
     def name(self):
@@ -821,17 +882,36 @@ class WindowManager(XObject):
         windows_ids.reverse()
         return windows_ids
 
-    def windows(self, filter=None, match='', stacking=True):
-        """Return list of all windows (newest/on top first)."""
+    def windows(self, filter=None, match='', stacking=True,
+                filter_types=None):
+        """Return list of all windows (newest/on top first).
+
+        filter_types - function accepting window's id and tuple of its
+                       types, types of all windows are fetched at once,
+                       before filter is used
+
+        """
         # TODO: regexp matching?
         windows_ids = self.windows_ids(stacking)
-        windows = [Window(win_id) for win_id in windows_ids]
+        # NOTE: Window creation doesn't send any requests to X Server,
+        #       so windows are created and filtered in one pass
+        windows = (Window(win_id) for win_id in windows_ids)
+        if filter_types:
+            windows = self.__types_filter(windows, filter_types)
         if filter:
-            windows = [window for window in windows if filter(window)]
+            windows = (window for window in windows if filter(window))
+        windows = list(windows)
         if match:
             windows = self.__name_matcher(windows, match)
         return windows
 
+    def __types_filter(self, windows, filter_types):
+        """Return windows with types accepted by filter_types."""
+        # Request types of all windows, and wait for replies afterwards
+        requests = [(window, window._request_type()) for window in windows]
+        return [window for window, type in requests
+                       if filter_types(window.id, type())]
+
     def __name_matcher(self, windows, match):
         """Filter and sort windows with matching name or class name."""
         match = match.strip().lower()
@@ -21,12 +21,19 @@
 """xlib.py - connecting with X Server, and handling all communication."""
 
 import logging
+import threading
+from contextlib import contextmanager
+from functools import reduce
+from operator import or_
 
 # NOTE: without import Xlib.threaded python-xlib is not thread-safe!
 from Xlib import threaded
-from Xlib import X, XK, error
+from Xlib import X, XK, Xatom, error
 from Xlib.display import Display
+from Xlib.protocol import rq
 from Xlib.protocol.event import ClientMessage
+from Xlib.protocol.request import GetGeometry, GetProperty
+from Xlib.xobject import icccm
 
 from pywo.core.basic import CustomTuple, Geometry
 from pywo.core.dispatch import EventDispatcher
@@ -49,7 +56,9 @@ class XObject(object):
     # TODO: setting Display, not only default one
     __DISPLAY = Display()
     __EVENT_DISPATCHER = EventDispatcher(__DISPLAY)
-    __BAD_ACCESS = error.CatchError(error.BadAccess)
+
+    # State of batched() blocks (per thread)
+    __BATCH = threading.local()
 
     # List of recognized key modifiers
     __KEY_MODIFIERS = {'Alt': X.Mod1Mask,
@@ -67,7 +76,17 @@ class XObject(object):
 
     __KEYCODES = {}
 
-    __WM_TYPE = None
+    # Already parsed keys, {(code, key): (modifiers, keycode), }
+    __MODIFIERS_KEYCODES = {}
+
+    # Already interned atoms, {name: atom, }
+    __ATOMS = {}
+
+    # Length (in 32-bit units) of property requested by _request_property()
+    __PROPERTY_LENGTH = 1 << 16
+
+    # Tuple of window manager's type(s), set by WindowManager
+    __WM_TYPE = CustomTuple([None])
 
     def __init__(self, win_id=None):
         """
@@ -88,17 +107,21 @@ class XObject(object):
     @classmethod
     def set_wm_type(cls, wm_type):
         """Set window manager's type."""
-        cls.__WM_TYPE = wm_type
+        cls.__WM_TYPE = CustomTuple([wm_type])
 
     @property
     def wm_type(self):
         """Return tuple of window manager's type(s)."""
-        return CustomTuple([self.__WM_TYPE])
+        return self.__WM_TYPE
 
     @classmethod
     def atom(cls, name):
         """Return atom with given name."""
-        return cls.__DISPLAY.intern_atom(name)
+        atom = cls.__ATOMS.get(name)
+        if atom is None:
+            atom = cls.__DISPLAY.intern_atom(name)
+            cls.__ATOMS[name] = atom
+        return atom
 
     @classmethod
     def atom_name(cls, atom):
@@ -111,6 +134,70 @@ class XObject(object):
         property = self._win.get_full_property(atom, 0)
         return property
 
+    def _request_property(self, name):
+        """Send request for property and return function waiting for reply.
+
+        Returned function returns property (None if there's no such property).
+        All requests can be sent at once, so there is only one round-trip
+        to X Server while waiting for replies.
+
+        """
+        # NOTE: request is long enough to get whole property at once
+        request = GetProperty(display=self._win.display, defer=True,
+                              delete=False, window=self._win,
+                              property=self.atom(name),
+                              type=X.AnyPropertyType,
+                              long_offset=0,
+                              long_length=self.__PROPERTY_LENGTH)
+        def reply():
+            request.reply()
+            if not request.property_type:
+                return None
+            request.format, request.value = request.value
+            return request
+        return reply
+
+    def _request_normal_hints(self):
+        """Send request for normal hints and return function waiting for reply.
+
+        Returned function works like Xlib's get_wm_normal_hints().
+        Check _request_property() for details.
+
+        """
+        struct = icccm.WMNormalHints
+        request = GetProperty(display=self._win.display, defer=True,
+                              delete=False, window=self._win,
+                              property=Xatom.WM_NORMAL_HINTS,
+                              type=Xatom.WM_SIZE_HINTS,
+                              long_offset=0,
+                              long_length=struct.static_size // 4)
+        def reply():
+            request.reply()
+            if not request.property_type:
+                return None
+            format, value = request.value
+            if format != 32:
+                return None
+            value = rq.encode_array(value)
+            if len(value) != struct.static_size:
+                return None
+            return struct.parse_binary(value, self._win.display)[0]
+        return reply
+
+    def _request_geometry(self):
+        """Send request for geometry and return function waiting for reply.
+
+        Returned function works like Xlib's get_geometry().
+        Check _request_property() for details.
+
+        """
+        request = GetGeometry(display=self._win.display, defer=True,
+                              drawable=self._win)
+        def reply():
+            request.reply()
+            return request
+        return reply
+
     def send_event(self, data, event_type, mask):
         """Send event to the root window."""
         event = ClientMessage(
@@ -141,36 +228,51 @@ class XObject(object):
 
     def __set_event_mask(self, masks):
         """Update event mask."""
-        event_mask = 0
-        log.debug('Setting %s masks for %s' % 
-                  ([str(e) for e in masks], self))
-        for mask in masks:
-            event_mask = event_mask | mask
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Setting %s masks for %s',
+                      [str(e) for e in masks], self)
+        event_mask = reduce(or_, masks, 0)
         self._win.change_attributes(event_mask=event_mask)
 
     def __grab_key(self, keycode, modifiers):
-        """Grab key."""
+        """Grab key.
+
+        Errors are checked at the end of the batched() block.
+
+        """
+        bad_access = error.CatchError(error.BadAccess)
         self._win.grab_key(keycode, modifiers, 
                            1, X.GrabModeAsync, X.GrabModeAsync,
-                           onerror=self.__BAD_ACCESS)
-        self.sync()
-        if self.__BAD_ACCESS.get_error():
-            log.error("Can't use %s" % self.keycode2str(modifiers, keycode))
+                           onerror=bad_access)
+        self.__BATCH.grabs.append((bad_access, modifiers, keycode))
 
     def grab_key(self, modifiers, keycode, numlock, capslock):
         """Grab key.
 
         Grab key alone, with CapsLock on and/or with NumLock on.
+        Inside batched() block requests are sent at the end of the block.
 
         """
-        if numlock in [0, 2] and capslock in [0, 2]:
-            self.__grab_key(keycode, modifiers)
-        if numlock in [0, 2] and capslock in [1, 2]:
-            self.__grab_key(keycode, modifiers | X.LockMask)
-        if numlock in [1, 2] and capslock in [0, 2]:
-            self.__grab_key(keycode, modifiers | X.Mod2Mask)
-        if numlock in [1, 2] and capslock in [1, 2]:
-            self.__grab_key(keycode, modifiers | X.LockMask | X.Mod2Mask)
+        with self.batched():
+            if numlock in [0, 2] and capslock in [0, 2]:
+                self.__grab_key(keycode, modifiers)
+            if numlock in [0, 2] and capslock in [1, 2]:
+                self.__grab_key(keycode, modifiers | X.LockMask)
+            if numlock in [1, 2] and capslock in [0, 2]:
+                self.__grab_key(keycode, modifiers | X.Mod2Mask)
+            if numlock in [1, 2] and capslock in [1, 2]:
+                self.__grab_key(keycode, modifiers | X.LockMask | X.Mod2Mask)
+
+    def grab_keys(self, keys, numlock, capslock):
+        """Grab all keys, sending requests at once.
+
+        keys - list of (modifiers, keycode) pairs
+        Check grab_key() for details.
+
+        """
+        with self.batched():
+            for modifiers, keycode in keys:
+                self.grab_key(modifiers, keycode, numlock, capslock)
 
     def ungrab_key(self, modifiers, keycode, numlock, capslock):
         """Ungrab key.
@@ -187,6 +289,17 @@ class XObject(object):
         if numlock in [1, 2] and capslock in [1, 2]:
             self._win.ungrab_key(keycode, modifiers | X.LockMask | X.Mod2Mask)
 
+    def ungrab_keys(self, keys, numlock, capslock):
+        """Ungrab all keys, sending requests at once.
+
+        keys - list of (modifiers, keycode) pairs
+        Check ungrab_key() for details.
+
+        """
+        with self.batched():
+            for modifiers, keycode in keys:
+                self.ungrab_key(modifiers, keycode, numlock, capslock)
+
     def draw_rectangle(self, x, y, width, height, line):
         """Draw simple rectangle on screen."""
         color = self.__DISPLAY.screen().black_pixel
@@ -216,9 +329,10 @@ class XObject(object):
             if not mask:
                 continue
             mask = mask.capitalize()
-            if mask not in cls.__KEY_MODIFIERS.keys():
+            modifier = cls.__KEY_MODIFIERS.get(mask)
+            if modifier is None:
                 raise ValueError('Invalid modifier: %s' % mask)
-            modifiers = modifiers | cls.__KEY_MODIFIERS[mask]
+            modifiers = modifiers | modifier
 
         return modifiers or X.AnyModifier
 
@@ -245,16 +359,39 @@ class XObject(object):
         For example: "Ctrl-A", "Super-Alt-x"
         
         """
+        modifiers_keycode = cls.__MODIFIERS_KEYCODES.get((code, key))
+        if modifiers_keycode is not None:
+            return modifiers_keycode
+        keys = code
         if key:
-            code = '-'.join([code, key])
-        code = code.split('-')
-        key = code[-1]
-        masks = code[:-1]
+            keys = '-'.join([code, key])
+        keys = keys.split('-')
+        masks = keys[:-1]
         
         modifiers = cls.str2modifiers(masks, True)
-        keycode = cls.str2keycode(key)
+        keycode = cls.str2keycode(keys[-1])
+        cls.__MODIFIERS_KEYCODES[(code, key)] = (modifiers, keycode)
         return (modifiers, keycode)
 
+    @classmethod
+    def invalidate_keycodes(cls):
+        """Forget already parsed keys.
+
+        Should be used when keyboard mapping is changed.
+
+        """
+        cls.__MODIFIERS_KEYCODES.clear()
+
+    @classmethod
+    def refresh_keyboard_mapping(cls, event):
+        """Update keyboard mapping after (raw) X.MappingNotify event.
+
+        Already parsed keys are forgotten, as their keycodes might change.
+
+        """
+        cls.__DISPLAY.refresh_keyboard_mapping(event)
+        cls.invalidate_keycodes()
+
     @classmethod
     def keycode2str(cls, modifiers, keycode):
         """Convert key as (modifiers, keycode) pair into string.
@@ -298,6 +435,42 @@ class XObject(object):
             root = cls.__DISPLAY.root
             return [Geometry(0, 0, root.screen_width, root.screen_height)]
 
+    @classmethod
+    @contextmanager
+    def batched(cls):
+        """Context manager sending all requests at once, at the end of block.
+
+        Xlib sends requests when request queue is flushed. Methods that
+        would flush queue (e.g. grab_key() to check for errors) don't do it
+        inside this block, request queue is flushed only once at the end
+        of the outermost block.
+        Blocks are tracked for each thread separately.
+
+        """
+        batch = cls.__BATCH
+        if not getattr(batch, 'depth', 0):
+            batch.depth = 0
+            batch.grabs = []
+        batch.depth += 1
+        try:
+            yield
+        finally:
+            batch.depth -= 1
+            if not batch.depth:
+                cls.__end_batch(batch.grabs)
+
+    @classmethod
+    def __end_batch(cls, grabs):
+        """Send all requests, and check for errors while grabbing keys."""
+        if not grabs:
+            cls.flush()
+            return
+        cls.sync()
+        for bad_access, modifiers, keycode in grabs:
+            if bad_access.get_error():
+                log.error("Can't use %s", cls.keycode2str(modifiers, keycode))
+        del grabs[:]
+
     @classmethod
     def flush(cls):
         """Flush request queue to X Server."""
@@ -75,9 +75,10 @@ def run():
         daemon.start()
     elif options.list_windows:
         WM = WindowManager()
-        windows = WM.windows(filters.AND(
-                    filters.ExcludeType(Type.DESKTOP, Type.SPLASH),
-                    filters.ExcludeState(State.SKIP_PAGER, State.SKIP_TASKBAR)))
+        windows = WM.windows(
+                    filters.ExcludeState(State.SKIP_PAGER, State.SKIP_TASKBAR),
+                    filter_types=filters.ExcludeType(Type.DESKTOP,
+                                                     Type.SPLASH).check_type)
         for window in windows:
             state = window.state
             win_desktop = window.desktop
@@ -104,9 +104,7 @@ class ModalKeyHandler(events.KeyHandler):
         self.use_modal_mode = False
         self.in_pywo_mode = False
         self.pywo_handler = PywoKeyPressHandler()
-        keys = [WM.str2modifiers_keycode('Escape')]
-        self.escape_handler = events.KeyHandler(key_press=self.normal_mode,
-                                                keys=keys)
+        self.escape_handler = events.KeyHandler(key_press=self.normal_mode)
         if config:
             self.set_config(config)
 
@@ -124,16 +122,18 @@ class ModalKeyHandler(events.KeyHandler):
             return
         log.debug('%s' % (event,))
         self.blink()
-        self.pywo_handler.grab_keys(WM)
-        self.escape_handler.grab_keys(WM)
+        with WM.batched():
+            self.pywo_handler.grab_keys(WM)
+            self.escape_handler.grab_keys(WM)
         self.in_pywo_mode = True
 
     def normal_mode(self, event):
         """Leave PyWO mode, enter normal mode."""
         log.debug('%s' % (event,))
         self.blink()
-        self.pywo_handler.ungrab_keys(WM)
-        self.escape_handler.ungrab_keys(WM)
+        with WM.batched():
+            self.pywo_handler.ungrab_keys(WM)
+            self.escape_handler.ungrab_keys(WM)
         self.in_pywo_mode = False
 
     def blink(self):
@@ -148,16 +148,17 @@ class ModalKeyHandler(events.KeyHandler):
     def set_config(self, config):
         """Set key mappings from config."""
         self.pywo_handler.set_config(config)
+        self.escape_handler.keys = [WM.str2modifiers_keycode('Escape')]
         pywo_mode_key = config.keys.get('pywo_mode')
         if not pywo_mode_key:
             self.use_modal_mode = False
+            self.in_pywo_mode = True
             return
         self.keys = [WM.str2modifiers_keycode(pywo_mode_key)]
         self.numlock = config.numlock
         self.capslock = config.capslock
         self.use_modal_mode = config.modal_mode
-        if not self.use_modal_mode:
-            self.in_pywo_mode = True
+        self.in_pywo_mode = not self.use_modal_mode
 
     def grab_keys(self, window):
         """Grab keys for self, or PywoKeyPressHandler."""
@@ -179,15 +180,29 @@ class ModalKeyHandler(events.KeyHandler):
 HANDLER = ModalKeyHandler()
 
 
+def keyboard_mapping(event):
+    """Grab keys again, with keycodes of the new keyboard mapping."""
+    log.info('Keyboard mapping changed, registering keyboard shortcuts again')
+    HANDLER.ungrab_keys(WM)
+    event.refresh_keyboard_mapping()
+    HANDLER.set_config(HANDLER.pywo_handler.config)
+    HANDLER.grab_keys(WM)
+
+
+MAPPING_HANDLER = events.MappingNotifyHandler(keyboard=keyboard_mapping)
+
+
 def setup(config):
     HANDLER.set_config(config)
 
 def start():
     log.info('Registering keyboard shortcuts')
     HANDLER.grab_keys(WM)
+    WM.register(MAPPING_HANDLER)
 
 
 def stop():
+    WM.unregister(MAPPING_HANDLER)
     HANDLER.ungrab_keys(WM)
     log.info('Keyboard shortcuts unregistered')
 
@@ -12,11 +12,15 @@ for them.
 """
 
 
+import array
 import copy
 import collections
+import os
 import random
 
 from Xlib import X, XK, Xatom, Xutil, protocol, error
+from Xlib.protocol import rq
+from Xlib.xobject import icccm
 import Xlib.display
 
 
@@ -132,6 +136,60 @@ class ClientMessage(object):
         self.data = data
 
 
+class GetProperty(object):
+
+    """Xlib.protocol.request.GetProperty mock.
+
+    Reply is ready at once, there is no need to wait for it.
+
+    """
+
+    def __init__(self, display, window, property, type,
+                 long_offset, long_length, delete=False, defer=False):
+        self.bytes_after = 0
+        if property == Xatom.WM_NORMAL_HINTS:
+            value = self.__normal_hints(window.get_wm_normal_hints())
+        else:
+            value = window.get_full_property(property, type)
+            value = value and value.value
+        # NOTE: real type of property is not stored, just mark it as set
+        self.property_type = value and 1 or X.NONE
+        self.value = (32, value)
+
+    def __normal_hints(self, hints):
+        # encode hints, just like the real WM_NORMAL_HINTS property
+        data = icccm.WMNormalHints.to_binary(
+                    flags=0,
+                    min_width=hints.min_width, min_height=hints.min_height,
+                    max_width=hints.max_width, max_height=hints.max_height,
+                    width_inc=hints.width_inc, height_inc=hints.height_inc,
+                    base_width=hints.base_width,
+                    base_height=hints.base_height,
+                    win_gravity=hints.win_gravity)
+        return array.array(rq.array_unsigned_codes[4], data)
+
+    def reply(self):
+        pass
+
+
+class GetGeometry(Geometry):
+
+    """Xlib.protocol.request.GetGeometry mock.
+
+    Reply is ready at once, there is no need to wait for it.
+
+    """
+
+    def __init__(self, display, drawable, defer=False):
+        geometry = drawable.get_geometry()
+        Geometry.__init__(self, geometry.x, geometry.y,
+                          geometry.width, geometry.height,
+                          geometry.depth, geometry.border_width)
+
+    def reply(self):
+        pass
+
+
 class ScreensQuery(object):
 
     def __init__(self, *geometries):
@@ -156,6 +214,8 @@ class Display(Xlib.display.Display):
         self.root_id = Xlib.display.Display.screen(self).root.id
         self.root = RootWindow(self, desktops, viewports or [1, 1])
         self.extensions = extensions  or []
+        # fake connection to X Server, created when needed
+        self.connection = None
 
     def intern_atom(self, name, only_if_exists=0):
         # Just delegate to real Display
@@ -247,6 +307,12 @@ class Display(Xlib.display.Display):
         # No need to flush or sync, incoming events are processed as they come
         pass
 
+    def fileno(self):
+        # No events support for now, so connection is never readable
+        if self.connection is None:
+            self.connection = os.pipe()
+        return self.connection[0]
+
     def pending_events(self):
         # No events support for now
         return 0
@@ -38,8 +38,13 @@ class MockedXlibTests(unittest.TestCase):
                                     extensions=EXTENSIONS)
         self.display = display
         xlib.ClientMessage = Xlib_mock.ClientMessage
+        xlib.GetProperty = Xlib_mock.GetProperty
+        xlib.GetGeometry = Xlib_mock.GetGeometry
         xlib.XObject._XObject__DISPLAY = display
+        xlib.XObject.invalidate_keycodes()
         self.WM = core.WindowManager()
+        # WindowManager is a singleton, bind it to the new display's root
+        xlib.XObject.__init__(self.WM)
         self.WM.update_type()
         self.win = self.map_window()
 
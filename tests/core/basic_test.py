@@ -2,6 +2,8 @@
 
 import unittest
 
+import copy
+import pickle
 import sys
 sys.path.insert(0, '../')
 sys.path.insert(0, './')
@@ -67,6 +69,10 @@ class SizeTests(unittest.TestCase):
         else:
             raise AssertionError
 
+    def test_pickle(self):
+        size = pickle.loads(pickle.dumps(Size(10, 20)))
+        self.assertEqual(size, Size(10, 20))
+
 
 class PostionTests(unittest.TestCase):
 
@@ -75,6 +81,10 @@ class PostionTests(unittest.TestCase):
         self.assertNotEqual(Position(1, 1), Position(1, 2))
         self.assertNotEqual(Position(1, 1), Position(2, 1))
 
+    def test_pickle(self):
+        position = pickle.loads(pickle.dumps(Position(10, 20)))
+        self.assertEqual(position, Position(10, 20))
+
 
 class GravityTests(unittest.TestCase):
 
@@ -94,6 +104,14 @@ class GravityTests(unittest.TestCase):
         self.assertEqual(Gravity(1.0, 0.0), self.TOP_RIGHT)
         self.assertEqual(Gravity(0.5, 0.5), self.MIDDLE)
 
+    def test_pickle(self):
+        gravity = pickle.loads(pickle.dumps(self.TOP_RIGHT))
+        self.assertEqual(gravity, self.TOP_RIGHT)
+        self.assertTrue(gravity.is_top)
+        self.assertTrue(gravity.is_right)
+        self.assertFalse(gravity.is_bottom)
+        self.assertFalse(gravity.is_left)
+
     def test_is_direction__top(self):
         self.assertTrue(self.TOP.is_top)
         self.assertTrue(not self.TOP.is_bottom)
@@ -260,6 +278,35 @@ class GeometryTests(unittest.TestCase):
         self.assertEqual(geo.x, 10)
         self.assertEqual(geo.y, 10)
 
+    def test_x2_y2(self):
+        geo = Geometry(10, 20, 100, 200)
+        self.assertEqual(geo.x2, 110)
+        self.assertEqual(geo.y2, 220)
+        geo.set_position(0, 0)
+        self.assertEqual(geo.x2, 100)
+        self.assertEqual(geo.y2, 200)
+        geo.set_size(50, 60)
+        self.assertEqual(geo.x2, 50)
+        self.assertEqual(geo.y2, 60)
+        geo.set_position(10, 20)
+        self.assertEqual(geo.x2, 60)
+        self.assertEqual(geo.y2, 80)
+
+    def test_set_size(self):
+        geo = Geometry(10, 20, 100, 200)
+        geo.set_size(50.5, 60)
+        self.assertEqual(geo, Geometry(10, 20, 50, 60))
+
+    def test_copy(self):
+        geo = Geometry(10, 20, 100, 200)
+        copies = [copy.copy(geo), copy.deepcopy(geo)]
+        copies += [pickle.loads(pickle.dumps(geo, protocol))
+                   for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]
+        for geo_copy in copies:
+            self.assertEqual(geo_copy, geo)
+            self.assertEqual(geo_copy.x2, 110)
+            self.assertEqual(geo_copy.y2, 220)
+
     def test_intersection_no_overlap(self):
         self.assertEqual(Geometry(0, 0, 1, 1) & Geometry(2, 0, 1, 1), None)
 
@@ -327,6 +374,16 @@ class ExtentsTests(unittest.TestCase):
         self.assertEqual(extents.horizontal, 30)
         self.assertEqual(extents.vertical, 30)
 
+    def test_copy(self):
+        extents = Extents(10, 20, 17, 13)
+        self.assertEqual(copy.copy(extents), extents)
+        self.assertEqual(pickle.loads(pickle.dumps(extents)), extents)
+        borderless = Extents(None, None, None, None)
+        for borderless_copy in [copy.deepcopy(borderless),
+                                pickle.loads(pickle.dumps(borderless))]:
+            self.assertFalse(borderless_copy)
+            self.assertEqual(borderless_copy, Extents(0, 0, 0, 0))
+
 
 if __name__ == '__main__':
     main_suite = unittest.TestSuite()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+import unittest
+
+import os
+import sys
+sys.path.insert(0, '../')
+sys.path.insert(0, './')
+
+from Xlib import X, Xatom
+from Xlib.protocol import event
+
+from tests.common_test import MockedXlibTests
+from pywo.core import events
+from pywo.core.dispatch import EventDispatcher
+
+
+class PropertyNotify(object):
+
+    """Raw X.PropertyNotify event."""
+
+    def __init__(self, window):
+        self.type = X.PropertyNotify
+        self.window = window
+        self.atom = Xatom.WM_NAME
+        self.state = X.PropertyNewValue
+
+
+class EventDispatcherTests(MockedXlibTests):
+
+    def setUp(self):
+        MockedXlibTests.setUp(self)
+        self.dispatcher = EventDispatcher(self.display)
+        self.dispatch = self.dispatcher._EventDispatcher__dispatch
+
+    def tearDown(self):
+        self.dispatcher.unregister()
+
+    @property
+    def thread(self):
+        return self.dispatcher._EventDispatcher__thread
+
+    @property
+    def wakeup_pipe(self):
+        return (self.dispatcher._EventDispatcher__wakeup_read,
+                self.dispatcher._EventDispatcher__wakeup_write)
+
+    def assertStopped(self, thread, pipe):
+        """Assert that thread stops at once, and wake up pipe is closed."""
+        # NOTE: wake up pipe is used, so there's no need to wait for timeout
+        thread.join(0.05)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.thread, None)
+        for fd in pipe:
+            self.assertRaises(OSError, os.fstat, fd)
+
+    def test_start(self):
+        self.assertEqual(self.thread, None)
+        self.dispatcher.register(self.WM, events.PropertyNotifyHandler())
+        thread = self.thread
+        self.assertTrue(thread.is_alive())
+        # same thread for next handlers
+        self.dispatcher.register(self.win, events.PropertyNotifyHandler())
+        self.assertTrue(self.thread is thread)
+
+    def test_stop__last_handler(self):
+        handler = events.PropertyNotifyHandler()
+        other_handler = events.PropertyNotifyHandler()
+        self.dispatcher.register(self.WM, handler)
+        self.dispatcher.register(self.win, other_handler)
+        thread, pipe = self.thread, self.wakeup_pipe
+        self.dispatcher.unregister(self.WM, handler)
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        self.dispatcher.unregister(self.win, other_handler)
+        self.assertStopped(thread, pipe)
+
+    def test_stop__all_handlers(self):
+        self.dispatcher.register(self.WM, events.PropertyNotifyHandler())
+        self.dispatcher.register(self.win, events.PropertyNotifyHandler())
+        thread, pipe = self.thread, self.wakeup_pipe
+        self.dispatcher.unregister()
+        self.assertStopped(thread, pipe)
+
+    def test_restart(self):
+        self.dispatcher.register(self.WM, events.PropertyNotifyHandler())
+        thread, pipe = self.thread, self.wakeup_pipe
+        self.dispatcher.unregister()
+        self.assertStopped(thread, pipe)
+        # new thread is started
+        self.dispatcher.register(self.WM, events.PropertyNotifyHandler())
+        self.assertTrue(self.thread.is_alive())
+        self.assertFalse(self.thread is thread)
+        # and events are still dispatched
+        property_events = []
+        self.dispatcher.register(self.WM, events.PropertyNotifyHandler(
+                                    property=property_events.append))
+        self.dispatch(PropertyNotify(self.display.root))
+        self.assertEqual(len(property_events), 1)
+
+    def test_dispatch_root_handler(self):
+        mapping_events = []
+        handler = events.MappingNotifyHandler(keyboard=mapping_events.append)
+        self.dispatcher.register(self.WM, handler)
+        self.dispatch(event.MappingNotify(request=X.MappingKeyboard,
+                                          first_keycode=8, count=1))
+        self.assertEqual(len(mapping_events), 1)
+        self.assertEqual(mapping_events[0].request, X.MappingKeyboard)
+        # pointer mapping changes are ignored
+        self.dispatch(event.MappingNotify(request=X.MappingPointer,
+                                          first_keycode=0, count=0))
+        self.assertEqual(len(mapping_events), 1)
+
+    def test_dispatch_root_handler_once(self):
+        property_events = []
+        handler = events.PropertyNotifyHandler(property=property_events.append)
+        self.dispatcher.register(self.WM, handler)
+        # event reported on root window
+        self.dispatch(PropertyNotify(self.display.root))
+        self.assertEqual(len(property_events), 1)
+        # event reported on other window
+        self.dispatch(PropertyNotify(self.win._win))
+        self.assertEqual(len(property_events), 2)
+
+
+if __name__ == '__main__':
+    main_suite = unittest.TestSuite()
+    for suite in [EventDispatcherTests, ]:
+        main_suite.addTest(unittest.TestLoader().loadTestsFromTestCase(suite))
+    unittest.TextTestRunner(verbosity=2).run(main_suite)
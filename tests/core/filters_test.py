@@ -53,6 +53,13 @@ class IncludeExcludeTypeTests(FiltersTest):
                            [self.normal_win, #self.dock_win, 
                             self.utility_win, self.dialog_win])
 
+    def test_check_type(self):
+        windows = self.WM.windows(
+                    filter_types=filters.STANDARD_TYPE.check_type)
+        self.assertEqual(set([win.id for win in windows]),
+                         set([self.normal_win.id, self.utility_win.id,
+                              self.dialog_win.id]))
+
 
 class IncludeExcludeStateTests(FiltersTest):
 
@@ -6,7 +6,7 @@ import sys
 sys.path.insert(0, '../')
 sys.path.insert(0, './')
 
-from Xlib import Xutil
+from Xlib import Xutil, Xatom
 
 from tests import Xlib_mock
 from tests.common_test import MockedXlibTests
@@ -14,6 +14,7 @@ from tests.common_test import DESKTOPS, DESKTOP_WIDTH, DESKTOP_HEIGHT, VIEWPORTS
 from tests.common_test import WIN_X, WIN_Y, WIN_WIDTH, WIN_HEIGHT
 from pywo.core import Window, WindowManager, State, Type
 from pywo.core import Position, Geometry, Layout
+from pywo.core import xlib
 from pywo.core.xlib import XObject
 
 
@@ -150,6 +151,20 @@ class WindowManagerTests(MockedXlibTests):
         windows = self.WM.windows(filter=fullscreen_filter)
         self.assertEqual(len(windows), 1)
 
+    def test_windows_filter_types(self):
+        def desktop_filter(win_id, type):
+            return Type.DESKTOP in type
+
+        windows = self.WM.windows(filter_types=desktop_filter)
+        self.assertEqual(len(windows), 0)
+        desktop = self.map_window(type=Type.DESKTOP)
+        windows = self.WM.windows(filter_types=desktop_filter)
+        self.assertEqual(windows, [desktop])
+        # both filters used
+        windows = self.WM.windows(filter=lambda window: False,
+                                  filter_types=desktop_filter)
+        self.assertEqual(len(windows), 0)
+
 
 class WindowManagerTests_name_matcher(MockedXlibTests):
 
@@ -250,7 +265,8 @@ class WindowManagerTests_name_matcher(MockedXlibTests):
         win2 = self.map_window(name='abc') # same viewport, desktop
         win3 = self.map_window(name='abc')
         geometry = win3.geometry
-        geometry.x += self.WM.workarea_geometry.width
+        geometry.set_position(geometry.x + self.WM.workarea_geometry.width,
+                              geometry.y)
         win3.set_geometry(geometry) # move to other viewport
         win4 = self.map_window(name='qwe abc xyz') # same viewport, desktop
         windows = self.WM.windows(match='abc')
@@ -317,6 +333,17 @@ class WindowTests_properties(MockedXlibTests):
         geometry = self.win.geometry
         self.assertEqualGeometry(geometry, 0, 0, 138, 45)
 
+    def test_geometry_no_normal_hints(self):
+        properties = []
+        def get_property(**kwargs):
+            properties.append(kwargs['property'])
+            return Xlib_mock.GetProperty(**kwargs)
+        xlib.GetProperty = get_property
+        self.win.geometry
+        self.assertFalse(Xatom.WM_NORMAL_HINTS in properties)
+        self.win.set_geometry(Geometry(50, 75, 138, 45))
+        self.assertTrue(Xatom.WM_NORMAL_HINTS in properties)
+
     # TODO: test with incremental windows!
     # TODO: test windows with maximal, and minimal size
     # TODO: test with windows with border_width > 0
@@ -337,6 +364,14 @@ class WindowTests_properties(MockedXlibTests):
         self.win.fullscreen(0)
         self.assertEqual(self.win.extents, Xlib_mock.EXTENTS_NORMAL)
 
+    def test_invalidate_extents(self):
+        self.assertEqual(self.win.extents, Xlib_mock.EXTENTS_NORMAL)
+        # decorations changed by window manager, extents are cached
+        self.win._win._set_extents(Xlib_mock.EXTENTS_FULLSCREEN)
+        self.assertEqual(self.win.extents, Xlib_mock.EXTENTS_NORMAL)
+        self.win.invalidate_extents()
+        self.assertEqual(self.win.extents, Xlib_mock.EXTENTS_FULLSCREEN)
+
 
 class WindowTests_state(MockedXlibTests):
 
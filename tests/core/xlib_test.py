@@ -21,6 +21,30 @@ class XObjectTests(MockedXlibTests):
         name = XObject.atom_name(atom)
         self.assertEqual(name, '_NET_WM_NAME')
 
+    def test_request_property(self):
+        reply = self.win._request_property('_NET_WM_NAME')
+        self.assertEqual(reply().value,
+                         self.win.get_property('_NET_WM_NAME').value)
+        reply = self.win._request_property('_NET_WM_STRUT')
+        self.assertEqual(reply(), None)
+
+    def test_request_normal_hints(self):
+        self.win._win.normal_hints = Xlib_mock.HINTS_TERMINAL
+        hints = self.win._request_normal_hints()()
+        self.assertEqual(hints.base_width, 2)
+        self.assertEqual(hints.width_inc, 7)
+        self.assertEqual(hints.height_inc, 15)
+        self.assertEqual(hints.min_width, 30)
+        self.assertEqual(hints.max_width, 0)
+
+    def test_request_geometry(self):
+        geometry = self.win._request_geometry()()
+        raw_geometry = self.win._win.get_geometry()
+        self.assertEqual((geometry.x, geometry.y,
+                          geometry.width, geometry.height),
+                         (raw_geometry.x, raw_geometry.y,
+                          raw_geometry.width, raw_geometry.height))
+
     def test_str2_methods_case_sensitivity(self):
         self.assertEqual(XObject.str2keycode('a'),
                          XObject.str2keycode('A'))
@@ -51,11 +75,68 @@ class XObjectTests(MockedXlibTests):
         self.assertEqual(modifiers, modifiers_keycode[0])
         self.assertEqual(keycode, modifiers_keycode[1])
 
+    def test_invalidate_keycodes(self):
+        keysyms = []
+        keysym_to_keycode = self.display.keysym_to_keycode
+        def count_keysym_to_keycode(keysym):
+            keysyms.append(keysym)
+            return keysym_to_keycode(keysym)
+        self.display.keysym_to_keycode = count_keysym_to_keycode
+        modifiers_keycode = XObject.str2modifiers_keycode('Alt-Shift-F1')
+        self.assertEqual(len(keysyms), 1)
+        # already parsed key is cached
+        XObject.str2modifiers_keycode('Alt-Shift-F1')
+        self.assertEqual(len(keysyms), 1)
+        # parsed again after invalidation
+        XObject.invalidate_keycodes()
+        self.assertEqual(XObject.str2modifiers_keycode('Alt-Shift-F1'),
+                         modifiers_keycode)
+        self.assertEqual(len(keysyms), 2)
+
+    def test_refresh_keyboard_mapping(self):
+        events = []
+        self.display.refresh_keyboard_mapping = events.append
+        XObject.str2modifiers_keycode('Alt-Shift-F1')
+        XObject.refresh_keyboard_mapping('event')
+        self.assertEqual(events, ['event'])
+        # new keycode is used after keyboard mapping is changed
+        self.display.keysym_to_keycode = lambda keysym: 123
+        self.assertEqual(XObject.str2modifiers_keycode('Alt-Shift-F1')[1], 123)
+
     def test_str2_methods_invalid_input(self):
         self.assertRaises(ValueError, XObject.str2modifiers, 'fsdfd')
         self.assertRaises(ValueError, XObject.str2keycode, 'Alt')
         self.assertRaises(ValueError, XObject.str2modifiers_keycode, 'Alt')
 
+    def test_batched(self):
+        requests = []
+        self.display.flush = lambda: requests.append('flush')
+        self.display.sync = lambda: requests.append('sync')
+        modifiers, keycode = XObject.str2modifiers_keycode('Alt-A')
+        with XObject.batched():
+            self.win.grab_key(modifiers, keycode, 2, 2)
+            self.win.grab_key(modifiers, keycode, 0, 0)
+            self.assertEqual(requests, [])
+        self.assertEqual(requests, ['sync'])
+
+    def test_batched__no_grabs(self):
+        requests = []
+        self.display.flush = lambda: requests.append('flush')
+        self.display.sync = lambda: requests.append('sync')
+        with XObject.batched():
+            with XObject.batched():
+                self.win.set_desktop(0)
+            self.assertEqual(requests, [])
+        self.assertEqual(requests, ['flush'])
+
+    def test_grab_keys(self):
+        requests = []
+        self.display.sync = lambda: requests.append('sync')
+        keys = [XObject.str2modifiers_keycode('Alt-A'),
+                XObject.str2modifiers_keycode('Alt-B')]
+        self.win.grab_keys(keys, 2, 2)
+        self.assertEqual(requests, ['sync'])
+
     def test_has_extension(self):
         self.assertTrue(XObject.has_extension('XINERAMA'))
         self.assertFalse(XObject.has_extension('FOO_BAR'))